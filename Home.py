@@ -1,7 +1,6 @@
 import streamlit as st
 import os
-from utils.database import init_database
-from utils.scheduler import start_scheduler
+from utils.bootstrap import init_services
 
 st.set_page_config(
 	page_title="Social Media Manager",
@@ -10,9 +9,8 @@ st.set_page_config(
 	initial_sidebar_state="expanded"
 )
 
-# Initialize core services
-init_database()
-start_scheduler()
+# Initialize core services (runs once per process)
+init_services()
 
 st.title("📱 Social Media Manager")
 st.write("Use the sidebar to navigate between pages.")
@@ -1,47 +1,43 @@
 import streamlit as st
-from utils.database import get_posts, get_failed_posts, update_post_status
+from utils.database import get_posts, get_failed_posts, count_by_status, count_posted_today, update_post_status
+from utils.bootstrap import init_services
+
+init_services()
 
 st.title("📊 Dashboard")
 
 # Get posts data
-posts_df = get_posts()
+status_counts = count_by_status()
 failed_posts = get_failed_posts()
 
 # Metrics
 col1, col2, col3, col4 = st.columns(4)
 
 with col1:
-	scheduled_count = len(posts_df[posts_df['status'] == 'scheduled']) if not posts_df.empty else 0
-	st.metric("Scheduled Posts", scheduled_count)
+	st.metric("Scheduled Posts", status_counts.get('scheduled', 0))
 
 with col2:
-	posted_count = len(posts_df[posts_df['status'] == 'posted']) if not posts_df.empty else 0
-	st.metric("Posted Today", posted_count)
+	st.metric("Posted Today", count_posted_today())
 
 with col3:
-	failed_count = len(failed_posts) if not failed_posts.empty else 0
+	failed_count = status_counts.get('failed', 0)
 	st.metric("Failed Posts", failed_count, delta=f"-{failed_count}" if failed_count > 0 else None)
 
 with col4:
-	total_count = len(posts_df) if not posts_df.empty else 0
-	st.metric("Total Posts", total_count)
+	st.metric("Total Posts", sum(status_counts.values()))
 
 # Upcoming posts
 st.subheader("📅 Upcoming Posts")
-if not posts_df.empty:
-	upcoming = posts_df[posts_df['status'] == 'scheduled'].head(10)
+if status_counts:
+	upcoming = get_posts(status='scheduled', limit=10)
 	if not upcoming.empty:
-		for idx, row in upcoming.iterrows():
-			with st.container():
-				col1, col2, col3 = st.columns([3, 2, 1])
-				with col1:
-					st.write(f"**{row['scheduled_time'][:16]}**")
-					st.write(row['content'][:100] + "..." if len(row['content']) > 100 else row['content'])
-				with col2:
-					platforms = row['platforms'].split(',') if row['platforms'] else []
-					st.write("Platforms: " + ", ".join(platforms))
-				with col3:
-					st.write(f"Status: {row['status']}")
+		# Build the display table with vectorized string ops and render it
+		# in one st.dataframe call instead of per-row widgets
+		display = upcoming.assign(
+			scheduled_time=upcoming['scheduled_time'].str.slice(0, 16),
+			content=upcoming['content'].str.slice(0, 100) + upcoming['content'].str.len().gt(100).map({True: '...', False: ''})
+		)[['scheduled_time', 'content', 'platforms', 'status']]
+		st.dataframe(display, hide_index=True, use_container_width=True)
 	else:
 		st.info("No upcoming posts scheduled")
 else:
@@ -1,12 +1,19 @@
 import streamlit as st
+import pandas as pd
 from datetime import datetime
-import pytz
+from zoneinfo import ZoneInfo
 import os
 from utils.database import get_posts, save_post, update_post_status
 from utils.api_clients import get_platform_char_limits, post_to_platforms
 from utils.scheduler import add_scheduled_post
+from utils.bootstrap import init_services
 
-TALLINN_TZ = pytz.timezone(os.getenv('TIMEZONE', 'Europe/Tallinn'))
+init_services()
+
+TALLINN_TZ = ZoneInfo(os.getenv('TIMEZONE', 'Europe/Tallinn'))
+
+# Capture the current time once per rerun instead of per widget
+now = datetime.now(TALLINN_TZ)
 
 st.title("✍️ Create New Post")
 
@@ -24,14 +31,14 @@ if 'edit_post_id' in st.session_state:
 st.subheader("Select Platforms")
 platforms = ["Facebook", "Threads", "X (Twitter)", "LinkedIn", "BlueSky", "Mastodon"]
 
-col1, col2, col3 = st.columns(3)
-selected_platforms = []
-
-for i, platform in enumerate(platforms):
-	with [col1, col2, col3][i % 3]:
-		default_checked = platform in editing_post['platforms'].split(',') if editing_post is not None else False
-		if st.checkbox(platform, key=f"platform_{platform}", value=default_checked):
-			selected_platforms.append(platform)
+# One multiselect instead of six checkboxes: a single widget to render
+# and one session-state entry per rerun
+editing_platforms = set(editing_post['platforms'].split(',')) if editing_post is not None else set()
+selected_platforms = st.multiselect(
+	"Platforms",
+	platforms,
+	default=[p for p in platforms if p in editing_platforms]
+)
 
 if not selected_platforms:
 	st.warning("Please select at least one platform")
@@ -40,7 +47,7 @@ if not selected_platforms:
 # Content input with character limits
 st.subheader("Post Content")
 char_limits = get_platform_char_limits()
-min_limit = min([char_limits.get(p, 280) for p in selected_platforms])
+min_limit = min(char_limits.get(p, 280) for p in selected_platforms)
 
 default_content = editing_post['content'] if editing_post is not None else ""
 content = st.text_area(
@@ -50,41 +57,43 @@ content = st.text_area(
 	max_chars=min_limit
 )
 
-# Show character count for each platform
+# Show character count for each platform in one component render
+# (this block reruns on every keystroke, so widget count matters)
 if content:
 	st.write("**Character count by platform:**")
-	for platform in selected_platforms:
-		limit = char_limits.get(platform, 280)
-		count = len(content)
-		color = "green" if count <= limit else "red"
-		st.write(f"- {platform}: {count}/{limit} characters", color=color)
+	count = len(content)
+	counts_df = pd.DataFrame(
+		[(platform, count, char_limits.get(platform, 280)) for platform in selected_platforms],
+		columns=['Platform', 'Count', 'Limit']
+	)
+	counts_df['OK'] = counts_df['Count'] <= counts_df['Limit']
+	st.dataframe(counts_df, hide_index=True)
 
 # Scheduling
 st.subheader("Schedule Post")
 
+# Parse the edited post's scheduled time once and reuse it for both inputs
+editing_scheduled = None
+if editing_post is not None and editing_post['scheduled_time']:
+	editing_scheduled = datetime.fromisoformat(editing_post['scheduled_time'])
+
 col1, col2 = st.columns(2)
 with col1:
-	default_date = datetime.now(TALLINN_TZ).date()
-	if editing_post is not None and editing_post['scheduled_time']:
-		default_date = datetime.fromisoformat(editing_post['scheduled_time']).date()
-	
+	default_date = editing_scheduled.date() if editing_scheduled else now.date()
+
 	scheduled_date = st.date_input(
 		"Date",
 		value=default_date,
-		min_value=datetime.now(TALLINN_TZ).date()
+		min_value=now.date()
 	)
 
 with col2:
-	default_time = datetime.now(TALLINN_TZ).time().replace(second=0, microsecond=0)
-	if editing_post is not None and editing_post['scheduled_time']:
-		default_time = datetime.fromisoformat(editing_post['scheduled_time']).time()
-	
+	default_time = editing_scheduled.time() if editing_scheduled else now.time().replace(second=0, microsecond=0)
+
 	scheduled_time = st.time_input("Time (Tallinn timezone)", value=default_time)
 
-# Combine date and time
-scheduled_datetime = TALLINN_TZ.localize(
-	datetime.combine(scheduled_date, scheduled_time)
-)
+# Combine date and time (zoneinfo attaches directly, no localize step)
+scheduled_datetime = datetime.combine(scheduled_date, scheduled_time, tzinfo=TALLINN_TZ)
 
 # Action buttons
 col1, col2, col3 = st.columns(3)
@@ -110,7 +119,7 @@ with col1:
 with col2:
 	if st.button("📅 Schedule Post", type="primary"):
 		if content and selected_platforms:
-			if scheduled_datetime > datetime.now(TALLINN_TZ):
+			if scheduled_datetime > now:
 				if editing_post is not None:
 					update_post_status(editing_post['id'], 'scheduled')
 					st.success(f"Post rescheduled for {scheduled_datetime.strftime('%Y-%m-%d %H:%M')}!")
@@ -133,22 +142,17 @@ with col3:
 	if st.button("🚀 Post Now"):
 		if content and selected_platforms:
 			success, errors = post_to_platforms(content, selected_platforms)
+			# One INSERT with the final status; no follow-up UPDATE needed
+			save_post(
+				content=content,
+				platforms=','.join(selected_platforms),
+				scheduled_time=now.isoformat(),
+				status='posted' if success else 'failed',
+				error_message=None if success else str(errors)
+			)
 			if success:
-				save_post(
-					content=content,
-					platforms=','.join(selected_platforms),
-					scheduled_time=datetime.now(TALLINN_TZ).isoformat(),
-					status='posted'
-				)
 				st.success("Posted successfully to all platforms!")
 			else:
-				save_post(
-					content=content,
-					platforms=','.join(selected_platforms),
-					scheduled_time=datetime.now(TALLINN_TZ).isoformat(),
-					status='failed',
-					error_message=str(errors)
-				)
 				st.error("Some posts failed. Check the Manage Posts section.")
 			if 'edit_post_id' in st.session_state:
 				del st.session_state.edit_post_id
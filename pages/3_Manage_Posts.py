@@ -1,30 +1,39 @@
 import streamlit as st
-from utils.database import get_posts, update_post_status, delete_post
+from utils.database import get_posts, count_posts, count_by_status, get_platform_options, update_post_status, delete_post
+from utils.bootstrap import init_services
 
-st.title("📝 Manage Posts")
+init_services()
 
-posts_df = get_posts()
+st.title("📝 Manage Posts")
 
-if posts_df.empty:
+if count_posts() == 0:
 	st.info("No posts found")
 	st.stop()
 
-# Filters
+# Filters (options come from dedicated SQL queries, not a full table read)
 col1, col2 = st.columns(2)
 with col1:
-	status_filter = st.selectbox("Filter by Status", ["All"] + list(posts_df['status'].unique()))
+	status_filter = st.selectbox("Filter by Status", ["All"] + sorted(count_by_status()))
 with col2:
-	platform_filter = st.selectbox("Filter by Platform", ["All"] + list(set([p for platforms in posts_df['platforms'].str.split(',') for p in platforms if p])))
-
-# Apply filters
-filtered_df = posts_df.copy()
-if status_filter != "All":
-	filtered_df = filtered_df[filtered_df['status'] == status_filter]
-if platform_filter != "All":
-	filtered_df = filtered_df[filtered_df['platforms'].str.contains(platform_filter)]
+	platform_filter = st.selectbox("Filter by Platform", ["All"] + get_platform_options())
+
+status = None if status_filter == "All" else status_filter
+platform = None if platform_filter == "All" else platform_filter
+
+# Filter and page in SQL: the DB only ever hands back the visible rows
+PAGE_SIZE = 20
+matching = count_posts(status=status, platform=platform)
+total_pages = max(1, -(-matching // PAGE_SIZE))
+if total_pages > 1:
+	page = st.number_input("Page", min_value=1, max_value=total_pages, value=1)
+	st.caption(f"Showing page {page} of {total_pages} ({matching} posts)")
+else:
+	page = 1
+view = get_posts(status=status, platform=platform,
+                 limit=PAGE_SIZE, offset=(page - 1) * PAGE_SIZE)
 
 # Display posts
-for idx, row in filtered_df.iterrows():
+for idx, row in view.iterrows():
 	with st.expander(f"{row['status'].title()} - {row['created_at'][:16]}"):
 		st.write("**Content:**")
 		st.write(row['content'])
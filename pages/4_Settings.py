@@ -1,55 +1,21 @@
 import streamlit as st
 import os
 import json
-from utils.database import get_posts, get_api_credentials, save_api_credentials
+from utils.database import export_posts_csv, get_api_credentials, save_api_credentials
+from utils.api_clients import invalidate_client_cache
+from utils.platforms import PLATFORM_FIELDS, PLATFORM_ENV_MAP
+from utils.bootstrap import init_services
+
+init_services()
 
 st.title("⚙️ Settings")
 
 st.subheader("API Configuration")
 st.info("Configure your API credentials for each platform. Values from the environment are used as defaults, and any changes here override them and are stored locally.")
 
-platforms = {
-	"Facebook": ["app_id", "app_secret", "access_token"],
-	"Threads": ["app_id", "app_secret", "access_token"],
-	"X (Twitter)": ["api_key", "api_secret", "access_token", "access_token_secret", "bearer_token"],
-	"LinkedIn": ["client_id", "client_secret", "access_token", "person_urn"],
-	"BlueSky": ["username", "password"],
-	"Mastodon": ["instance_url", "access_token"]
-}
-
-env_keys = {
-	"Facebook": {
-		"app_id": "FACEBOOK_APP_ID",
-		"app_secret": "FACEBOOK_APP_SECRET",
-		"access_token": "FACEBOOK_ACCESS_TOKEN",
-	},
-	"Threads": {
-		"app_id": "THREADS_APP_ID",
-		"app_secret": "THREADS_APP_SECRET",
-		"access_token": "THREADS_ACCESS_TOKEN",
-	},
-	"X (Twitter)": {
-		"api_key": "TWITTER_API_KEY",
-		"api_secret": "TWITTER_API_SECRET",
-		"access_token": "TWITTER_ACCESS_TOKEN",
-		"access_token_secret": "TWITTER_ACCESS_TOKEN_SECRET",
-		"bearer_token": "TWITTER_BEARER_TOKEN",
-	},
-	"LinkedIn": {
-		"client_id": "LINKEDIN_CLIENT_ID",
-		"client_secret": "LINKEDIN_CLIENT_SECRET",
-		"access_token": "LINKEDIN_ACCESS_TOKEN",
-		"person_urn": "LINKEDIN_PERSON_URN",
-	},
-	"BlueSky": {
-		"username": "BLUESKY_USERNAME",
-		"password": "BLUESKY_PASSWORD",
-	},
-	"Mastodon": {
-		"instance_url": "MASTODON_INSTANCE_URL",
-		"access_token": "MASTODON_ACCESS_TOKEN",
-	},
-}
+# Field lists and env-var names come from the shared definitions
+platforms = PLATFORM_FIELDS
+env_keys = PLATFORM_ENV_MAP
 
 for platform, fields in platforms.items():
 	with st.expander(f"{platform} API Settings"):
@@ -75,6 +41,7 @@ for platform, fields in platforms.items():
 		if st.button(f"Save {platform} Settings", key=f"save_{platform}"):
 			try:
 				save_api_credentials(platform, json.dumps(updated_values))
+				invalidate_client_cache(platform)
 				st.success(f"{platform} settings saved!")
 			except Exception as e:
 				st.error(f"Failed to save {platform} settings: {e}")
@@ -88,12 +55,11 @@ with st.expander("Timezone Settings"):
 
 with st.expander("Data Management"):
 	if st.button("Export All Posts"):
-		export_df = get_posts()
-		if not export_df.empty:
-			csv = export_df.to_csv(index=False)
+		csv_bytes = export_posts_csv()
+		if csv_bytes:
 			st.download_button(
 				"Download CSV",
-				csv,
+				csv_bytes,
 				"social_media_posts.csv",
 				"text/csv"
 			)
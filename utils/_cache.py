@@ -0,0 +1,43 @@
+import threading
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+class MemoryCache:
+    """Small thread-safe TTL cache for hot read-mostly lookups.
+
+    Entries expire after `ttl` seconds and the oldest entry is evicted
+    once `max_size` is reached, so memory stays bounded. Writers call
+    delete()/clear() to invalidate instead of waiting for expiry.
+    """
+
+    def __init__(self, ttl: float = 30.0, max_size: int = 256):
+        self._ttl = ttl
+        self._max_size = max_size
+        self._data: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at < time.time():
+                del self._data[key]
+                return default
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        with self._lock:
+            if key not in self._data and len(self._data) >= self._max_size:
+                # Dicts iterate in insertion order, so this drops the oldest
+                self._data.pop(next(iter(self._data)))
+            self._data[key] = (time.time() + self._ttl, value)
+
+    def delete(self, key: Hashable):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
@@ -1,10 +1,10 @@
+import importlib
 import requests
-import json
+import threading
 import time
-import os
-from typing import Dict, List, Tuple, Optional
-from utils.database import get_api_credentials, add_to_queue
-import streamlit as st
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Tuple, Optional
 
 # Character limits for each platform
 PLATFORM_CHAR_LIMITS = {
@@ -20,373 +20,151 @@ def get_platform_char_limits() -> Dict[str, int]:
     """Return character limits for all platforms"""
     return PLATFORM_CHAR_LIMITS
 
-class APIClient:
-    """Base class for API clients"""
-    
-    def __init__(self, platform: str):
-        self.platform = platform
-        self.credentials = self._load_credentials()
-    
-    def _env_credentials_for_platform(self) -> Dict[str, str]:
-        """Load credentials for this platform from environment variables.
-        These act as defaults and may be overridden by values in the DB.
-        """
-        platform_env_map: Dict[str, Dict[str, str]] = {
-            "Facebook": {
-                "app_id": "FACEBOOK_APP_ID",
-                "app_secret": "FACEBOOK_APP_SECRET",
-                "access_token": "FACEBOOK_ACCESS_TOKEN",
-            },
-            "Threads": {
-                "app_id": "THREADS_APP_ID",
-                "app_secret": "THREADS_APP_SECRET",
-                "access_token": "THREADS_ACCESS_TOKEN",
-            },
-            "X (Twitter)": {
-                "api_key": "TWITTER_API_KEY",
-                "api_secret": "TWITTER_API_SECRET",
-                "access_token": "TWITTER_ACCESS_TOKEN",
-                "access_token_secret": "TWITTER_ACCESS_TOKEN_SECRET",
-                "bearer_token": "TWITTER_BEARER_TOKEN",
-            },
-            "LinkedIn": {
-                "client_id": "LINKEDIN_CLIENT_ID",
-                "client_secret": "LINKEDIN_CLIENT_SECRET",
-                "access_token": "LINKEDIN_ACCESS_TOKEN",
-                "person_urn": "LINKEDIN_PERSON_URN",
-            },
-            "BlueSky": {
-                "username": "BLUESKY_USERNAME",
-                "password": "BLUESKY_PASSWORD",
-            },
-            "Mastodon": {
-                "instance_url": "MASTODON_INSTANCE_URL",
-                "access_token": "MASTODON_ACCESS_TOKEN",
-            },
-        }
-        env_mapping = platform_env_map.get(self.platform, {})
-        env_creds: Dict[str, str] = {}
-        for key, env_name in env_mapping.items():
-            value = os.getenv(env_name)
-            if value:
-                env_creds[key] = value
-        return env_creds
-
-    def _load_credentials(self) -> Optional[Dict]:
-        """Load credentials with precedence: env defaults, overridden by DB settings"""
-        # Start with environment-provided defaults
-        combined_creds: Dict[str, str] = self._env_credentials_for_platform()
-
-        # Merge any DB-provided overrides on top
-        creds_json = get_api_credentials(self.platform)
-        if creds_json:
-            try:
-                db_creds = json.loads(creds_json)
-                if isinstance(db_creds, dict):
-                    combined_creds.update({k: v for k, v in db_creds.items() if v is not None and v != ""})
-            except json.JSONDecodeError:
-                pass
-
-        return combined_creds if combined_creds else None
-    
-    def post(self, content: str) -> Tuple[bool, Optional[str]]:
-        """Post content to platform - to be implemented by subclasses"""
-        raise NotImplementedError
-
-class FacebookClient(APIClient):
-    """Facebook Graph API client"""
-    
-    def __init__(self):
-        super().__init__("Facebook")
-    
-    def post(self, content: str) -> Tuple[bool, Optional[str]]:
-        if not self.credentials:
-            return False, "No Facebook credentials configured"
-        
-        try:
-            # Facebook Graph API endpoint
-            url = f"https://graph.facebook.com/v18.0/me/feed"
-            
-            data = {
-                'message': content,
-                'access_token': self.credentials.get('access_token')
-            }
-            
-            response = requests.post(url, data=data, timeout=30)
-            
-            if response.status_code == 200:
-                return True, None
-            else:
-                return False, f"Facebook API error: {response.status_code} - {response.text}"
-                
-        except requests.exceptions.RequestException as e:
-            return False, f"Facebook connection error: {str(e)}"
-        except Exception as e:
-            return False, f"Facebook unexpected error: {str(e)}"
-
-class ThreadsClient(APIClient):
-    """Meta Threads API client"""
-    
-    def __init__(self):
-        super().__init__("Threads")
-    
-    def post(self, content: str) -> Tuple[bool, Optional[str]]:
-        if not self.credentials:
-            return False, "No Threads credentials configured"
-        
-        try:
-            # Threads API is still in development, using placeholder
-            # This would need to be updated when Threads API is fully available
-            return False, "Threads API not yet fully available"
-            
-        except Exception as e:
-            return False, f"Threads error: {str(e)}"
-
-class TwitterClient(APIClient):
-    """X (Twitter) API v2 client"""
-    
-    def __init__(self):
-        super().__init__("X (Twitter)")
-    
-    def post(self, content: str) -> Tuple[bool, Optional[str]]:
-        if not self.credentials:
-            return False, "No Twitter credentials configured"
-        
-        try:
-            # Twitter API v2 endpoint
-            url = "https://api.twitter.com/2/tweets"
-            
-            headers = {
-                'Authorization': f"Bearer {self.credentials.get('bearer_token')}",
-                'Content-Type': 'application/json'
-            }
-            
-            data = {
-                'text': content
-            }
-            
-            response = requests.post(url, headers=headers, json=data, timeout=30)
-            
-            if response.status_code == 201:
-                return True, None
-            else:
-                return False, f"Twitter API error: {response.status_code} - {response.text}"
-                
-        except requests.exceptions.RequestException as e:
-            return False, f"Twitter connection error: {str(e)}"
-        except Exception as e:
-            return False, f"Twitter unexpected error: {str(e)}"
-
-class LinkedInClient(APIClient):
-    """LinkedIn API client"""
-    
-    def __init__(self):
-        super().__init__("LinkedIn")
-    
-    def post(self, content: str) -> Tuple[bool, Optional[str]]:
-        if not self.credentials:
-            return False, "No LinkedIn credentials configured"
-        
-        try:
-            # LinkedIn API endpoint for sharing
-            url = "https://api.linkedin.com/v2/ugcPosts"
-            
-            headers = {
-                'Authorization': f"Bearer {self.credentials.get('access_token')}",
-                'Content-Type': 'application/json',
-                'X-Restli-Protocol-Version': '2.0.0'
-            }
-            
-            # Get person URN (would need to be retrieved from profile)
-            person_urn = self.credentials.get('person_urn', 'urn:li:person:YOUR_PERSON_ID')
-            
-            data = {
-                "author": person_urn,
-                "lifecycleState": "PUBLISHED",
-                "specificContent": {
-                    "com.linkedin.ugc.ShareContent": {
-                        "shareCommentary": {
-                            "text": content
-                        },
-                        "shareMediaCategory": "NONE"
-                    }
-                },
-                "visibility": {
-                    "com.linkedin.ugc.MemberNetworkVisibility": "PUBLIC"
-                }
-            }
-            
-            response = requests.post(url, headers=headers, json=data, timeout=30)
-            
-            if response.status_code == 201:
-                return True, None
-            else:
-                return False, f"LinkedIn API error: {response.status_code} - {response.text}"
-                
-        except requests.exceptions.RequestException as e:
-            return False, f"LinkedIn connection error: {str(e)}"
-        except Exception as e:
-            return False, f"LinkedIn unexpected error: {str(e)}"
-
-class BlueSkyClient(APIClient):
-    """BlueSky AT Protocol client"""
-    
-    def __init__(self):
-        super().__init__("BlueSky")
-    
-    def post(self, content: str) -> Tuple[bool, Optional[str]]:
-        if not self.credentials:
-            return False, "No BlueSky credentials configured"
-        
-        try:
-            # BlueSky AT Protocol endpoint
-            # First, create a session
-            session_url = "https://bsky.social/xrpc/com.atproto.server.createSession"
-            
-            session_data = {
-                'identifier': self.credentials.get('username'),
-                'password': self.credentials.get('password')
-            }
-            
-            session_response = requests.post(session_url, json=session_data, timeout=30)
-            
-            if session_response.status_code != 200:
-                return False, f"BlueSky auth error: {session_response.status_code}"
-            
-            session_info = session_response.json()
-            access_token = session_info.get('accessJwt')
-            
-            # Now post
-            post_url = "https://bsky.social/xrpc/com.atproto.repo.createRecord"
-            
-            headers = {
-                'Authorization': f"Bearer {access_token}",
-                'Content-Type': 'application/json'
-            }
-            
-            post_data = {
-                "repo": session_info.get('did'),
-                "collection": "app.bsky.feed.post",
-                "record": {
-                    "text": content,
-                    "createdAt": time.strftime('%Y-%m-%dT%H:%M:%S.000Z', time.gmtime())
-                }
-            }
-            
-            response = requests.post(post_url, headers=headers, json=post_data, timeout=30)
-            
-            if response.status_code == 200:
-                return True, None
-            else:
-                return False, f"BlueSky post error: {response.status_code} - {response.text}"
-                
-        except requests.exceptions.RequestException as e:
-            return False, f"BlueSky connection error: {str(e)}"
-        except Exception as e:
-            return False, f"BlueSky unexpected error: {str(e)}"
-
-class MastodonClient(APIClient):
-    """Mastodon API client"""
-    
-    def __init__(self):
-        super().__init__("Mastodon")
-    
-    def post(self, content: str) -> Tuple[bool, Optional[str]]:
-        if not self.credentials:
-            return False, "No Mastodon credentials configured"
-        
-        try:
-            # Mastodon API endpoint
-            instance_url = self.credentials.get('instance_url', 'https://mastodon.social')
-            url = f"{instance_url}/api/v1/statuses"
-            
-            headers = {
-                'Authorization': f"Bearer {self.credentials.get('access_token')}",
-                'Content-Type': 'application/json'
-            }
-            
-            data = {
-                'status': content,
-                'visibility': 'public'
-            }
-            
-            response = requests.post(url, headers=headers, json=data, timeout=30)
-            
-            if response.status_code == 200:
-                return True, None
-            else:
-                return False, f"Mastodon API error: {response.status_code} - {response.text}"
-                
-        except requests.exceptions.RequestException as e:
-            return False, f"Mastodon connection error: {str(e)}"
-        except Exception as e:
-            return False, f"Mastodon unexpected error: {str(e)}"
-
-# Platform client mapping
-PLATFORM_CLIENTS = {
-    "Facebook": FacebookClient,
-    "Threads": ThreadsClient,
-    "X (Twitter)": TwitterClient,
-    "LinkedIn": LinkedInClient,
-    "BlueSky": BlueSkyClient,
-    "Mastodon": MastodonClient
+# Client classes live in utils/clients/ and are imported on first use,
+# so pages that only need char limits or cache invalidation don't pay
+# for loading the whole client stack
+_PLATFORM_MODULES: Dict[str, str] = {
+    "Facebook": "utils.clients.facebook:FacebookClient",
+    "Threads": "utils.clients.threads:ThreadsClient",
+    "X (Twitter)": "utils.clients.twitter:TwitterClient",
+    "LinkedIn": "utils.clients.linkedin:LinkedInClient",
+    "BlueSky": "utils.clients.bluesky:BlueSkyClient",
+    "Mastodon": "utils.clients.mastodon:MastodonClient",
 }
 
+_CLASS_CACHE: Dict[str, type] = {}
+
+def _resolve(platform: str) -> type:
+    """Import and memoize the client class for a platform"""
+    cls = _CLASS_CACHE.get(platform)
+    if cls is None:
+        module_name, class_name = _PLATFORM_MODULES[platform].split(':')
+        cls = getattr(importlib.import_module(module_name), class_name)
+        _CLASS_CACHE[platform] = cls
+    return cls
+
+# Cached client instances so repeated posts don't re-read credentials
+# from the DB and re-parse JSON on every call
+_CLIENT_CACHE: Dict[str, object] = {}
+
+def _get_client(platform: str):
+    """Return a cached client for a platform, constructing it on first use"""
+    client = _CLIENT_CACHE.get(platform)
+    if client is None:
+        client = _resolve(platform)()
+        _CLIENT_CACHE[platform] = client
+    return client
+
+# Dispatch table of bound post methods, populated lazily from the cached
+# clients so the hot path is a dict lookup plus a call
+_POST_FN: Dict[str, Callable[[str], Tuple[bool, Optional[str]]]] = {}
+
+def _post_fn(platform: str) -> Callable[[str], Tuple[bool, Optional[str]]]:
+    fn = _POST_FN.get(platform)
+    if fn is None:
+        fn = _get_client(platform).post
+        _POST_FN[platform] = fn
+    return fn
+
+def invalidate_client_cache(platform: Optional[str] = None):
+    """Drop cached clients so new credentials take effect.
+
+    Called from the Settings page after saving credentials; with no
+    argument the whole cache is cleared.
+    """
+    if platform is None:
+        _CLIENT_CACHE.clear()
+        _POST_FN.clear()
+    else:
+        _CLIENT_CACHE.pop(platform, None)
+        _POST_FN.pop(platform, None)
+
+# Shared bounded worker pool for the fan-out: one pool per process
+# rather than one per call, with concurrency capped to the number of
+# supported platforms (the client-side connection pool bounds per-host sockets)
+_EXECUTOR = ThreadPoolExecutor(max_workers=len(_PLATFORM_MODULES),
+                               thread_name_prefix="post")
+
+# Per-platform pacing state: posts to the same host honor that host's
+# rate-limit delay, while posts to different hosts are unconstrained
+_LAST_POST_AT: Dict[str, float] = {}
+_PLATFORM_LOCKS: Dict[str, threading.Lock] = defaultdict(threading.Lock)
+
+def _respect_rate_limit(platform: str):
+    """Sleep just long enough to honor the platform's per-host delay"""
+    with _PLATFORM_LOCKS[platform]:
+        wait = get_rate_limit_delay(platform) - (time.time() - _LAST_POST_AT.get(platform, 0.0))
+        if wait > 0:
+            time.sleep(wait)
+        _LAST_POST_AT[platform] = time.time()
+
+def _safe_post(platform: str, content: str) -> Tuple[bool, Optional[str]]:
+    """Post via the cached client's bound method for a platform.
+
+    Only network failures are swallowed here; programming errors bubble
+    up so they surface instead of being logged as post failures.
+    """
+    try:
+        _respect_rate_limit(platform)
+        return _post_fn(platform)(content)
+    except requests.RequestException as e:
+        return False, f"Connection error: {str(e)}"
+
 def post_to_platforms(content: str, platforms: List[str]) -> Tuple[bool, Dict[str, str]]:
     """
-    Post content to multiple platforms
+    Post content to multiple platforms concurrently
     Returns: (all_successful, errors_dict)
+
+    Each platform targets a different host, so the posts are fanned out
+    on a thread pool instead of running serially with a fixed delay.
+
+    Only failures are tracked; success is simply the absence of errors,
+    so there is no parallel results dict to build and scan afterwards.
     """
-    results = {}
     errors = {}
-    
+
+    supported = []
     for platform in platforms:
-        if platform in PLATFORM_CLIENTS:
-            try:
-                client_class = PLATFORM_CLIENTS[platform]
-                client = client_class()
-                
-                success, error = client.post(content)
-                results[platform] = success
-                
-                if not success and error:
-                    errors[platform] = error
-                
-                # Small delay between posts to avoid rate limits
-                time.sleep(1)
-                
-            except Exception as e:
-                results[platform] = False
-                errors[platform] = f"Unexpected error: {str(e)}"
+        if platform in _PLATFORM_MODULES:
+            supported.append(platform)
         else:
-            results[platform] = False
             errors[platform] = f"Platform '{platform}' not supported"
-    
-    all_successful = all(results.values())
-    
-    return all_successful, errors
+
+    # Fail over-limit platforms up front instead of burning an HTTP
+    # round-trip (and API quota) on a guaranteed rejection
+    valid = validate_content_length(content, supported)
+    for platform in supported:
+        if not valid[platform]:
+            errors[platform] = f"Content exceeds {PLATFORM_CHAR_LIMITS[platform]} character limit"
+    supported = [p for p in supported if valid[p]]
+
+    if supported:
+        futures = {_EXECUTOR.submit(_safe_post, platform, content): platform
+                   for platform in supported}
+        for future in as_completed(futures):
+            platform = futures[future]
+            success, error = future.result()
+            if not success:
+                errors[platform] = error or "Unknown error"
+
+    return not errors, errors
 
 def post_to_single_platform(content: str, platform: str) -> Tuple[bool, Optional[str]]:
     """Post content to a single platform"""
-    if platform not in PLATFORM_CLIENTS:
+    if platform not in _PLATFORM_MODULES:
         return False, f"Platform '{platform}' not supported"
-    
-    try:
-        client_class = PLATFORM_CLIENTS[platform]
-        client = client_class()
-        return client.post(content)
-    except Exception as e:
-        return False, f"Unexpected error: {str(e)}"
+
+    if len(content) > PLATFORM_CHAR_LIMITS.get(platform, 280):
+        return False, f"Content exceeds {PLATFORM_CHAR_LIMITS[platform]} character limit"
+
+    return _safe_post(platform, content)
 
 def validate_content_length(content: str, platforms: List[str]) -> Dict[str, bool]:
     """Validate content length for each platform"""
-    validation_results = {}
-    
-    for platform in platforms:
-        limit = PLATFORM_CHAR_LIMITS.get(platform, 280)
-        validation_results[platform] = len(content) <= limit
-    
-    return validation_results
+    # Measure once; the per-platform check is just a comparison
+    length = len(content)
+    return {platform: length <= PLATFORM_CHAR_LIMITS.get(platform, 280)
+            for platform in platforms}
 
 def get_rate_limit_delay(platform: str) -> int:
     """Get recommended delay between posts for a platform (in seconds)"""
@@ -398,5 +176,5 @@ def get_rate_limit_delay(platform: str) -> int:
         "BlueSky": 5,      # AT Protocol is generally permissive
         "Mastodon": 10     # Varies by instance
     }
-    
-    return delays.get(platform, 15)  # Default 15 seconds
\ No newline at end of file
+
+    return delays.get(platform, 15)  # Default 15 seconds
@@ -0,0 +1,14 @@
+import streamlit as st
+from utils.database import init_database
+from utils.scheduler import start_scheduler
+
+@st.cache_resource(show_spinner=False)
+def init_services() -> bool:
+    """Initialize the database and scheduler exactly once per process.
+
+    Streamlit re-executes page scripts on every rerun; caching this as a
+    resource keeps reruns from re-entering init and leaking threads.
+    """
+    init_database()
+    start_scheduler()
+    return True
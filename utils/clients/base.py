@@ -0,0 +1,84 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import json
+import os
+from typing import Dict, Tuple, Optional
+from utils.database import get_api_credentials, get_configured_platforms
+from utils.platforms import PLATFORM_ENV_MAP
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _json_loads(data: str) -> Dict:
+    """Parse JSON with orjson when available (C implementation, 2-5x faster)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _json_dumps(obj) -> bytes:
+    """Serialize JSON to bytes, avoiding requests' internal json.dumps"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode('utf-8')
+
+# Shared HTTP session so repeated posts reuse keep-alive TCP/TLS connections
+# instead of paying a fresh handshake per request. Transient 429/5xx
+# responses are retried in-connection with exponential backoff rather
+# than failing the post outright.
+_SESSION = requests.Session()
+_retry = Retry(
+    total=3,
+    backoff_factor=0.5,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=frozenset(['POST']),
+    respect_retry_after_header=True,
+)
+_adapter = HTTPAdapter(pool_connections=8, pool_maxsize=32, max_retries=_retry)
+_SESSION.mount("https://", _adapter)
+_SESSION.mount("http://", _adapter)
+
+class APIClient:
+    """Base class for API clients"""
+
+    def __init__(self, platform: str):
+        self.platform = platform
+        self.credentials = self._load_credentials()
+
+    def _env_credentials_for_platform(self) -> Dict[str, str]:
+        """Load credentials for this platform from environment variables.
+        These act as defaults and may be overridden by values in the DB.
+        """
+        env_mapping = PLATFORM_ENV_MAP.get(self.platform, {})
+        env_creds: Dict[str, str] = {}
+        for key, env_name in env_mapping.items():
+            value = os.getenv(env_name)
+            if value:
+                env_creds[key] = value
+        return env_creds
+
+    def _load_credentials(self) -> Optional[Dict]:
+        """Load credentials with precedence: env defaults, overridden by DB settings"""
+        # Start with environment-provided defaults
+        combined_creds: Dict[str, str] = self._env_credentials_for_platform()
+
+        # Merge any DB-provided overrides on top, skipping the credentials
+        # query entirely for platforms that were never configured in the UI
+        creds_json = None
+        if self.platform in get_configured_platforms():
+            creds_json = get_api_credentials(self.platform)
+        if creds_json:
+            try:
+                db_creds = _json_loads(creds_json)
+                if isinstance(db_creds, dict):
+                    combined_creds.update({k: v for k, v in db_creds.items() if v is not None and v != ""})
+            except ValueError:
+                pass
+
+        return combined_creds if combined_creds else None
+
+    def post(self, content: str) -> Tuple[bool, Optional[str]]:
+        """Post content to platform - to be implemented by subclasses"""
+        raise NotImplementedError
@@ -0,0 +1,132 @@
+import requests
+import base64
+import json
+import time
+from typing import Dict, Tuple, Optional
+from utils.clients.base import APIClient, _SESSION, _json_dumps
+
+class BlueSkyClient(APIClient):
+    """BlueSky AT Protocol client"""
+
+    # Cached sessions keyed by username so the createSession round-trip
+    # isn't paid on every post (the JWT is valid for hours)
+    _sessions: Dict[str, Dict] = {}
+
+    def __init__(self):
+        super().__init__("BlueSky")
+
+    @staticmethod
+    def _jwt_expiry(token: str) -> float:
+        """Extract the exp claim from a JWT without extra dependencies"""
+        try:
+            payload = token.split('.')[1]
+            payload += '=' * (-len(payload) % 4)  # restore base64 padding
+            claims = json.loads(base64.urlsafe_b64decode(payload))
+            return float(claims['exp'])
+        except Exception:
+            # Fall back to a conservative lifetime if the token is opaque
+            return time.time() + 3600
+
+    def _create_session(self) -> Tuple[Optional[Dict], Optional[str]]:
+        """Authenticate from scratch and cache the resulting session"""
+        session_url = "https://bsky.social/xrpc/com.atproto.server.createSession"
+
+        session_data = {
+            'identifier': self.credentials.get('username'),
+            'password': self.credentials.get('password')
+        }
+
+        session_response = _SESSION.post(session_url, data=_json_dumps(session_data),
+                                         headers={'Content-Type': 'application/json'}, timeout=30)
+
+        if session_response.status_code != 200:
+            return None, f"BlueSky auth error: {session_response.status_code}"
+
+        return self._cache_session(session_response.json()), None
+
+    def _refresh_session(self, refresh_jwt: str) -> Optional[Dict]:
+        """Renew a near-expiry session; returns None if refresh failed"""
+        refresh_url = "https://bsky.social/xrpc/com.atproto.server.refreshSession"
+
+        headers = {'Authorization': f"Bearer {refresh_jwt}"}
+        response = _SESSION.post(refresh_url, headers=headers, timeout=30)
+
+        if response.status_code != 200:
+            return None
+
+        return self._cache_session(response.json())
+
+    def _cache_session(self, session_info: Dict) -> Dict:
+        session = {
+            'access_jwt': session_info.get('accessJwt'),
+            'refresh_jwt': session_info.get('refreshJwt'),
+            'did': session_info.get('did'),
+            'expires_at': self._jwt_expiry(session_info.get('accessJwt', ''))
+        }
+        self._sessions[self.credentials.get('username')] = session
+        return session
+
+    def _get_session(self) -> Tuple[Optional[Dict], Optional[str]]:
+        """Return a valid session, refreshing or re-authenticating as needed"""
+        session = self._sessions.get(self.credentials.get('username'))
+
+        # Reuse the cached JWT while it has a comfortable margin left
+        if session and time.time() < session['expires_at'] - 60:
+            return session, None
+
+        # Near or past expiry: try the cheaper refresh first
+        if session and session.get('refresh_jwt'):
+            refreshed = self._refresh_session(session['refresh_jwt'])
+            if refreshed:
+                return refreshed, None
+
+        return self._create_session()
+
+    def _create_record(self, session: Dict, content: str) -> requests.Response:
+        post_url = "https://bsky.social/xrpc/com.atproto.repo.createRecord"
+
+        headers = {
+            'Authorization': f"Bearer {session['access_jwt']}",
+            'Content-Type': 'application/json'
+        }
+
+        post_data = {
+            "repo": session['did'],
+            "collection": "app.bsky.feed.post",
+            "record": {
+                "text": content,
+                "createdAt": time.strftime('%Y-%m-%dT%H:%M:%S.000Z', time.gmtime())
+            }
+        }
+
+        return _SESSION.post(post_url, headers=headers, data=_json_dumps(post_data), timeout=30)
+
+    def post(self, content: str) -> Tuple[bool, Optional[str]]:
+        if not self.credentials:
+            return False, "No BlueSky credentials configured"
+
+        try:
+            session, error = self._get_session()
+            if session is None:
+                return False, error
+
+            response = self._create_record(session, content)
+
+            # A 401 means the cached JWT was revoked early; drop it,
+            # authenticate from scratch and retry once
+            if response.status_code == 401:
+                self._sessions.pop(self.credentials.get('username'), None)
+                session, error = self._get_session()
+                if session is None:
+                    return False, error
+                response = self._create_record(session, content)
+
+            if response.status_code == 200:
+                return True, None
+            else:
+                return False, f"BlueSky post error: {response.status_code} - {response.text}"
+
+        except requests.exceptions.RequestException as e:
+            return False, f"BlueSky connection error: {str(e)}"
+        except Exception as e:
+            return False, f"BlueSky unexpected error: {str(e)}"
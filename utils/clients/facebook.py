@@ -0,0 +1,34 @@
+import requests
+from typing import Tuple, Optional
+from utils.clients.base import APIClient, _SESSION
+
+class FacebookClient(APIClient):
+    """Facebook Graph API client"""
+
+    def __init__(self):
+        super().__init__("Facebook")
+
+    def post(self, content: str) -> Tuple[bool, Optional[str]]:
+        if not self.credentials:
+            return False, "No Facebook credentials configured"
+
+        try:
+            # Facebook Graph API endpoint
+            url = f"https://graph.facebook.com/v18.0/me/feed"
+
+            data = {
+                'message': content,
+                'access_token': self.credentials.get('access_token')
+            }
+
+            response = _SESSION.post(url, data=data, timeout=30)
+
+            if response.status_code == 200:
+                return True, None
+            else:
+                return False, f"Facebook API error: {response.status_code} - {response.text}"
+
+        except requests.exceptions.RequestException as e:
+            return False, f"Facebook connection error: {str(e)}"
+        except Exception as e:
+            return False, f"Facebook unexpected error: {str(e)}"
@@ -0,0 +1,54 @@
+import requests
+from typing import Tuple, Optional
+from utils.clients.base import APIClient, _SESSION, _json_dumps
+
+class LinkedInClient(APIClient):
+    """LinkedIn API client"""
+
+    def __init__(self):
+        super().__init__("LinkedIn")
+
+    def post(self, content: str) -> Tuple[bool, Optional[str]]:
+        if not self.credentials:
+            return False, "No LinkedIn credentials configured"
+
+        try:
+            # LinkedIn API endpoint for sharing
+            url = "https://api.linkedin.com/v2/ugcPosts"
+
+            headers = {
+                'Authorization': f"Bearer {self.credentials.get('access_token')}",
+                'Content-Type': 'application/json',
+                'X-Restli-Protocol-Version': '2.0.0'
+            }
+
+            # Get person URN (would need to be retrieved from profile)
+            person_urn = self.credentials.get('person_urn', 'urn:li:person:YOUR_PERSON_ID')
+
+            data = {
+                "author": person_urn,
+                "lifecycleState": "PUBLISHED",
+                "specificContent": {
+                    "com.linkedin.ugc.ShareContent": {
+                        "shareCommentary": {
+                            "text": content
+                        },
+                        "shareMediaCategory": "NONE"
+                    }
+                },
+                "visibility": {
+                    "com.linkedin.ugc.MemberNetworkVisibility": "PUBLIC"
+                }
+            }
+
+            response = _SESSION.post(url, headers=headers, data=_json_dumps(data), timeout=30)
+
+            if response.status_code == 201:
+                return True, None
+            else:
+                return False, f"LinkedIn API error: {response.status_code} - {response.text}"
+
+        except requests.exceptions.RequestException as e:
+            return False, f"LinkedIn connection error: {str(e)}"
+        except Exception as e:
+            return False, f"LinkedIn unexpected error: {str(e)}"
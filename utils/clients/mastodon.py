@@ -0,0 +1,40 @@
+import requests
+from typing import Tuple, Optional
+from utils.clients.base import APIClient, _SESSION, _json_dumps
+
+class MastodonClient(APIClient):
+    """Mastodon API client"""
+
+    def __init__(self):
+        super().__init__("Mastodon")
+
+    def post(self, content: str) -> Tuple[bool, Optional[str]]:
+        if not self.credentials:
+            return False, "No Mastodon credentials configured"
+
+        try:
+            # Mastodon API endpoint
+            instance_url = self.credentials.get('instance_url', 'https://mastodon.social')
+            url = f"{instance_url}/api/v1/statuses"
+
+            headers = {
+                'Authorization': f"Bearer {self.credentials.get('access_token')}",
+                'Content-Type': 'application/json'
+            }
+
+            data = {
+                'status': content,
+                'visibility': 'public'
+            }
+
+            response = _SESSION.post(url, headers=headers, data=_json_dumps(data), timeout=30)
+
+            if response.status_code == 200:
+                return True, None
+            else:
+                return False, f"Mastodon API error: {response.status_code} - {response.text}"
+
+        except requests.exceptions.RequestException as e:
+            return False, f"Mastodon connection error: {str(e)}"
+        except Exception as e:
+            return False, f"Mastodon unexpected error: {str(e)}"
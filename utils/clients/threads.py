@@ -0,0 +1,20 @@
+from typing import Tuple, Optional
+from utils.clients.base import APIClient
+
+class ThreadsClient(APIClient):
+    """Meta Threads API client"""
+
+    def __init__(self):
+        super().__init__("Threads")
+
+    def post(self, content: str) -> Tuple[bool, Optional[str]]:
+        if not self.credentials:
+            return False, "No Threads credentials configured"
+
+        try:
+            # Threads API is still in development, using placeholder
+            # This would need to be updated when Threads API is fully available
+            return False, "Threads API not yet fully available"
+
+        except Exception as e:
+            return False, f"Threads error: {str(e)}"
@@ -0,0 +1,38 @@
+import requests
+from typing import Tuple, Optional
+from utils.clients.base import APIClient, _SESSION, _json_dumps
+
+class TwitterClient(APIClient):
+    """X (Twitter) API v2 client"""
+
+    def __init__(self):
+        super().__init__("X (Twitter)")
+
+    def post(self, content: str) -> Tuple[bool, Optional[str]]:
+        if not self.credentials:
+            return False, "No Twitter credentials configured"
+
+        try:
+            # Twitter API v2 endpoint
+            url = "https://api.twitter.com/2/tweets"
+
+            headers = {
+                'Authorization': f"Bearer {self.credentials.get('bearer_token')}",
+                'Content-Type': 'application/json'
+            }
+
+            data = {
+                'text': content
+            }
+
+            response = _SESSION.post(url, headers=headers, data=_json_dumps(data), timeout=30)
+
+            if response.status_code == 201:
+                return True, None
+            else:
+                return False, f"Twitter API error: {response.status_code} - {response.text}"
+
+        except requests.exceptions.RequestException as e:
+            return False, f"Twitter connection error: {str(e)}"
+        except Exception as e:
+            return False, f"Twitter unexpected error: {str(e)}"
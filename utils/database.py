@@ -1,16 +1,128 @@
+import io
+import queue
 import sqlite3
+import threading
 import pandas as pd
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Optional, List
+from typing import Dict, Optional, List
 import os
+import streamlit as st
+from utils._cache import MemoryCache
 
 DATABASE_PATH = os.getenv('DATABASE_PATH', 'social_media_posts.db')
 
+# In-process TTL caches for the scheduler-side hot lookups. get_post_by_id
+# fires on every scheduled-job run and get_api_credentials on every posting
+# attempt; both are read-mostly, so a dict hit replaces a B-tree seek.
+# st.cache_data isn't used here because these run on worker threads.
+_post_cache = MemoryCache(ttl=30)
+_creds_cache = MemoryCache(ttl=300)
+
+# One connection per process, shared by the Streamlit threads and the
+# queue worker. Reconnecting per call costs several syscalls and throws
+# away SQLite's prepared-statement cache; with WAL mode a single
+# connection serves concurrent readers fine, and writes serialize
+# through _write_lock below.
+_conn: Optional[sqlite3.Connection] = None
+_conn_lock = threading.Lock()
+
+# Serializes writers across threads (SQLite allows one writer at a time)
+_write_lock = threading.Lock()
+
+def _get_conn() -> sqlite3.Connection:
+    """Return the shared connection, creating and tuning it on first use"""
+    global _conn
+    if _conn is None:
+        with _conn_lock:
+            if _conn is None:
+                # cached_statements keeps compiled plans for every distinct
+                # SQL string in this module, so repeated calls skip the
+                # parse/plan step entirely (the SQL text must stay stable
+                # for the cache to hit — no string formatting into queries)
+                conn = sqlite3.connect(DATABASE_PATH, check_same_thread=False,
+                                       cached_statements=128)
+                # WAL lets readers proceed alongside the writer; NORMAL sync
+                # avoids an fsync per commit while staying durable enough for
+                # this workload. The remaining pragmas keep temp structures
+                # and hot pages in memory and map the file for reads.
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.execute("PRAGMA temp_store=MEMORY")
+                conn.execute("PRAGMA cache_size=-64000")
+                conn.execute("PRAGMA mmap_size=268435456")
+                # Enforce the queue's ON DELETE CASCADE (off by default)
+                conn.execute("PRAGMA foreign_keys=ON")
+                # Rows unpack like tuples but also support name access,
+                # without the per-helper column bookkeeping
+                conn.row_factory = sqlite3.Row
+                _conn = conn
+    return _conn
+
+# Pool of read-only connections for queries. Under WAL, readers never
+# block the writer or each other, so the queue worker and the Streamlit
+# threads can query in parallel while writes go through the shared RW
+# connection above.
+_RO_POOL_SIZE = 4
+_ro_pool: Optional[queue.Queue] = None
+
+@contextmanager
+def _read_conn():
+    """Check out a pooled read-only connection for the duration of a query"""
+    global _ro_pool
+    if _ro_pool is None:
+        with _conn_lock:
+            if _ro_pool is None:
+                pool = queue.Queue()
+                for _ in range(_RO_POOL_SIZE):
+                    ro = sqlite3.connect(f"file:{DATABASE_PATH}?mode=ro",
+                                         uri=True, check_same_thread=False,
+                                         cached_statements=128)
+                    ro.row_factory = sqlite3.Row
+                    pool.put(ro)
+                _ro_pool = pool
+    conn = _ro_pool.get()
+    try:
+        yield conn
+    finally:
+        _ro_pool.put(conn)
+
+@contextmanager
+def db_transaction():
+    """Run a group of statements on the shared connection in one transaction.
+
+    Batching related writes this way costs one commit/fsync instead of
+    one per statement.
+    """
+    conn = _get_conn()
+    with _write_lock:
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+def _clear_post_caches():
+    """Invalidate cached post queries after any write"""
+    try:
+        get_posts.clear()
+        get_failed_posts.clear()
+        count_by_status.clear()
+        count_posted_today.clear()
+        count_posts.clear()
+        get_platform_options.clear()
+        export_posts_csv.clear()
+    except Exception:
+        # Cache may not be initialized outside a Streamlit context
+        pass
+    _post_cache.clear()
+
 def init_database():
     """Initialize SQLite database with required tables"""
-    conn = sqlite3.connect(DATABASE_PATH)
+    conn = _get_conn()
     c = conn.cursor()
-    
+
     # Posts table
     c.execute('''CREATE TABLE IF NOT EXISTS posts
                  (id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -20,15 +132,16 @@ def init_database():
                   status TEXT DEFAULT 'draft',
                   created_at TEXT DEFAULT CURRENT_TIMESTAMP,
                   error_message TEXT)''')
-    
+
     # API credentials table
     c.execute('''CREATE TABLE IF NOT EXISTS api_credentials
                  (id INTEGER PRIMARY KEY AUTOINCREMENT,
                   platform TEXT UNIQUE NOT NULL,
                   credentials TEXT NOT NULL,
                   created_at TEXT DEFAULT CURRENT_TIMESTAMP)''')
-    
-    # Post queue for rate limiting
+
+    # Post queue for rate limiting; queue rows die with their post so
+    # delete_post is a single statement
     c.execute('''CREATE TABLE IF NOT EXISTS post_queue
                  (id INTEGER PRIMARY KEY AUTOINCREMENT,
                   post_id INTEGER,
@@ -36,195 +149,445 @@ def init_database():
                   status TEXT DEFAULT 'pending',
                   retry_count INTEGER DEFAULT 0,
                   last_attempt TEXT,
-                  FOREIGN KEY(post_id) REFERENCES posts(id))''')
-    
+                  next_attempt_at TEXT,
+                  FOREIGN KEY(post_id) REFERENCES posts(id) ON DELETE CASCADE)''')
+
+    # Databases created before the cascade was declared need the table
+    # rebuilt (SQLite can't add a foreign-key action in place)
+    table_sql = c.execute("""SELECT sql FROM sqlite_master
+                             WHERE type = 'table' AND name = 'post_queue'""").fetchone()[0]
+    if 'ON DELETE CASCADE' not in table_sql:
+        c.execute("ALTER TABLE post_queue RENAME TO post_queue_old")
+        c.execute('''CREATE TABLE post_queue
+                     (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                      post_id INTEGER,
+                      platform TEXT,
+                      status TEXT DEFAULT 'pending',
+                      retry_count INTEGER DEFAULT 0,
+                      last_attempt TEXT,
+                      next_attempt_at TEXT,
+                      FOREIGN KEY(post_id) REFERENCES posts(id) ON DELETE CASCADE)''')
+        c.execute('''INSERT INTO post_queue (id, post_id, platform, status, retry_count, last_attempt)
+                     SELECT id, post_id, platform, status, retry_count, last_attempt
+                     FROM post_queue_old''')
+        c.execute("DROP TABLE post_queue_old")
+
+    # Databases from before retry backoff just need the extra column
+    queue_columns = [row[1] for row in c.execute("PRAGMA table_info(post_queue)").fetchall()]
+    if 'next_attempt_at' not in queue_columns:
+        c.execute("ALTER TABLE post_queue ADD COLUMN next_attempt_at TEXT")
+
+    # Composite index so filtered, ordered post listings are index range
+    # scans instead of full-table scans + sort
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_posts_status_created
+                 ON posts(status, created_at DESC)''')
+
+    # Queue-worker and scheduler queries: pending-item fetches, the
+    # per-post completion aggregate, startup rescheduling, and cleanup
+    # all become index range seeks instead of full scans
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_queue_platform_status
+                 ON post_queue(platform, status, id)''')
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_queue_post
+                 ON post_queue(post_id)''')
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_posts_status_sched
+                 ON posts(status, scheduled_time)''')
+    c.execute('''CREATE INDEX IF NOT EXISTS idx_posts_cleanup
+                 ON posts(status, created_at)''')
+
+    # Promote a post's status the moment its last queue item reaches a
+    # terminal state. Firing only on completed/failed transitions, the
+    # trigger replaces the Python-side aggregate that used to rerun
+    # after every successful platform post; it shares the queue
+    # update's write transaction, so post and queue can never disagree.
+    c.execute('''CREATE TRIGGER IF NOT EXISTS trg_post_completion
+                 AFTER UPDATE OF status ON post_queue
+                 WHEN NEW.status IN ('completed', 'failed')
+                 BEGIN
+                     UPDATE posts SET
+                         status = CASE
+                             WHEN (SELECT COUNT(*) FROM post_queue
+                                   WHERE post_id = NEW.post_id AND status = 'failed') = 0
+                                 THEN 'posted'
+                             WHEN (SELECT COUNT(*) FROM post_queue
+                                   WHERE post_id = NEW.post_id AND status = 'completed') > 0
+                                 THEN 'partial'
+                             ELSE 'failed'
+                         END,
+                         error_message = CASE
+                             WHEN (SELECT COUNT(*) FROM post_queue
+                                   WHERE post_id = NEW.post_id AND status = 'failed') = 0
+                                 THEN error_message
+                             WHEN (SELECT COUNT(*) FROM post_queue
+                                   WHERE post_id = NEW.post_id AND status = 'completed') > 0
+                                 THEN 'Posted to '
+                                      || (SELECT COUNT(*) FROM post_queue
+                                          WHERE post_id = NEW.post_id AND status = 'completed')
+                                      || '/'
+                                      || (SELECT COUNT(*) FROM post_queue
+                                          WHERE post_id = NEW.post_id)
+                                      || ' platforms'
+                             ELSE 'Failed to post to all platforms'
+                         END
+                     WHERE id = NEW.post_id
+                     AND NOT EXISTS (SELECT 1 FROM post_queue
+                                     WHERE post_id = NEW.post_id
+                                     AND status IN ('pending', 'processing'));
+                 END''')
+
     conn.commit()
-    conn.close()
 
-def save_post(content: str, platforms: str, scheduled_time: Optional[str] = None, 
+def save_post(content: str, platforms: str, scheduled_time: Optional[str] = None,
               status: str = 'draft', error_message: Optional[str] = None) -> int:
     """Save a post to the database and return the post ID"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    c = conn.cursor()
-    
-    c.execute('''INSERT INTO posts (content, platforms, scheduled_time, status, error_message)
-                 VALUES (?, ?, ?, ?, ?)''',
-              (content, platforms, scheduled_time, status, error_message))
-    
-    post_id = c.lastrowid
-    conn.commit()
-    conn.close()
-    
+    conn = _get_conn()
+    with _write_lock:
+        c = conn.execute(
+            '''INSERT INTO posts (content, platforms, scheduled_time, status, error_message)
+               VALUES (?, ?, ?, ?, ?)''',
+            (content, platforms, scheduled_time, status, error_message))
+        post_id = c.lastrowid
+        conn.commit()
+
+    _clear_post_caches()
+
     return post_id
 
-def get_posts() -> pd.DataFrame:
-    """Retrieve all posts from database"""
+def _posts_where(status: Optional[str], platform: Optional[str]):
+    """Build the shared WHERE clause + params for post queries"""
+    conditions = []
+    params = []
+
+    if status:
+        conditions.append("status = ?")
+        params.append(status)
+    if platform:
+        # Wrap both sides in commas for an exact token match, so one
+        # platform name can never match inside another
+        conditions.append("(',' || platforms || ',') LIKE ('%,' || ? || ',%')")
+        params.append(platform)
+
+    clause = (" WHERE " + " AND ".join(conditions)) if conditions else ""
+    return clause, params
+
+@st.cache_data(ttl=30, show_spinner=False)
+def get_posts(status: Optional[str] = None, platform: Optional[str] = None,
+              limit: Optional[int] = None, offset: int = 0) -> pd.DataFrame:
+    """Retrieve posts from database, filtering and paging in SQL"""
     try:
-        conn = sqlite3.connect(DATABASE_PATH)
-        df = pd.read_sql_query(
-            "SELECT * FROM posts ORDER BY created_at DESC", 
-            conn
-        )
-        conn.close()
-        return df
+        clause, params = _posts_where(status, platform)
+        query = f"SELECT * FROM posts{clause} ORDER BY created_at DESC"
+
+        with _read_conn() as conn:
+            if limit:
+                query += " LIMIT ? OFFSET ?"
+                params.extend([limit, offset])
+                return pd.read_sql_query(query, conn, params=params)
+
+            # Unbounded reads are built in chunks: read_sql_query's
+            # one-shot path can transiently use several times the final
+            # DataFrame's memory on larger tables
+            frames = list(pd.read_sql_query(query, conn, params=params, chunksize=500))
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True, copy=False)
     except Exception as e:
         print(f"Error retrieving posts: {e}")
         return pd.DataFrame()
 
+@st.cache_data(ttl=30, show_spinner=False)
+def count_posts(status: Optional[str] = None, platform: Optional[str] = None) -> int:
+    """Count posts matching the given filters without fetching rows"""
+    try:
+        clause, params = _posts_where(status, platform)
+        with _read_conn() as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM posts{clause}", params).fetchone()[0]
+    except Exception as e:
+        print(f"Error counting posts: {e}")
+        return 0
+
+@st.cache_data(ttl=30, show_spinner=False)
+def get_platform_options() -> List[str]:
+    """Distinct platform names across all posts, for filter dropdowns"""
+    try:
+        with _read_conn() as conn:
+            rows = conn.execute("SELECT DISTINCT platforms FROM posts").fetchall()
+        options = set()
+        for (platforms,) in rows:
+            if platforms:
+                options.update(p for p in platforms.split(',') if p)
+        return sorted(options)
+    except Exception as e:
+        print(f"Error retrieving platform options: {e}")
+        return []
+
+@st.cache_data(ttl=60, show_spinner=False)
+def export_posts_csv() -> bytes:
+    """Serialize all posts to CSV in chunks to cap peak memory.
+
+    Reading and writing 5000 rows at a time keeps peak usage at one
+    chunk rather than the whole table plus its CSV string.
+    """
+    buf = io.BytesIO()
+    with _read_conn() as conn:
+        chunks = pd.read_sql_query(
+            "SELECT * FROM posts ORDER BY created_at DESC", conn, chunksize=5000
+        )
+        for i, chunk in enumerate(chunks):
+            chunk.to_csv(buf, index=False, header=(i == 0))
+    return buf.getvalue()
+
+@st.cache_data(ttl=30, show_spinner=False)
 def get_failed_posts() -> pd.DataFrame:
     """Retrieve failed posts from database"""
     try:
-        conn = sqlite3.connect(DATABASE_PATH)
-        df = pd.read_sql_query(
-            "SELECT * FROM posts WHERE status = 'failed' ORDER BY created_at DESC", 
-            conn
-        )
-        conn.close()
-        return df
+        with _read_conn() as conn:
+            return pd.read_sql_query(
+                "SELECT * FROM posts WHERE status = 'failed' ORDER BY created_at DESC",
+                conn
+            )
     except Exception as e:
         print(f"Error retrieving failed posts: {e}")
         return pd.DataFrame()
 
+@st.cache_data(ttl=30, show_spinner=False)
+def count_posted_today() -> int:
+    """Count posts published since midnight (counted in SQL, not pandas)"""
+    try:
+        with _read_conn() as conn:
+            return conn.execute(
+                """SELECT COUNT(*) FROM posts
+                   WHERE status = 'posted'
+                   AND datetime(created_at) >= datetime('now', 'start of day')"""
+            ).fetchone()[0]
+    except Exception as e:
+        print(f"Error counting today's posts: {e}")
+        return 0
+
+@st.cache_data(ttl=30, show_spinner=False)
+def count_by_status() -> Dict[str, int]:
+    """Count posts per status in a single aggregate query"""
+    try:
+        with _read_conn() as conn:
+            return dict(conn.execute(
+                "SELECT status, COUNT(*) FROM posts GROUP BY status").fetchall())
+    except Exception as e:
+        print(f"Error counting posts: {e}")
+        return {}
+
 def get_scheduled_posts() -> pd.DataFrame:
     """Retrieve scheduled posts from database"""
     try:
-        conn = sqlite3.connect(DATABASE_PATH)
-        df = pd.read_sql_query(
-            "SELECT * FROM posts WHERE status = 'scheduled' ORDER BY scheduled_time ASC", 
-            conn
-        )
-        conn.close()
-        return df
+        with _read_conn() as conn:
+            return pd.read_sql_query(
+                "SELECT * FROM posts WHERE status = 'scheduled' ORDER BY scheduled_time ASC",
+                conn
+            )
     except Exception as e:
         print(f"Error retrieving scheduled posts: {e}")
         return pd.DataFrame()
 
+def iter_scheduled_posts():
+    """Yield scheduled posts as sqlite3.Row objects, oldest first.
+
+    The startup rescheduling path only reads a couple of columns per
+    row, so this avoids building a DataFrame for it.
+    """
+    with _read_conn() as conn:
+        rows = conn.execute(
+            "SELECT * FROM posts WHERE status = 'scheduled' ORDER BY scheduled_time ASC"
+        ).fetchall()
+    yield from rows
+
 def update_post_status(post_id: int, status: str, error_message: Optional[str] = None):
     """Update post status"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    c = conn.cursor()
-    
-    if error_message:
-        c.execute("UPDATE posts SET status = ?, error_message = ? WHERE id = ?", 
-                  (status, error_message, post_id))
-    else:
-        c.execute("UPDATE posts SET status = ? WHERE id = ?", (status, post_id))
-    
-    conn.commit()
-    conn.close()
+    conn = _get_conn()
+    with _write_lock:
+        if error_message:
+            conn.execute("UPDATE posts SET status = ?, error_message = ? WHERE id = ?",
+                         (status, error_message, post_id))
+        else:
+            conn.execute("UPDATE posts SET status = ? WHERE id = ?", (status, post_id))
+        conn.commit()
+
+    _clear_post_caches()
 
 def delete_post(post_id: int):
-    """Delete a post and related queue entries"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    c = conn.cursor()
-    
-    # Delete from queue first
-    c.execute("DELETE FROM post_queue WHERE post_id = ?", (post_id,))
-    
-    # Delete the post
-    c.execute("DELETE FROM posts WHERE id = ?", (post_id,))
-    
-    conn.commit()
-    conn.close()
+    """Delete a post; its queue entries cascade inside the engine"""
+    conn = _get_conn()
+    with _write_lock:
+        conn.execute("DELETE FROM posts WHERE id = ?", (post_id,))
+        conn.commit()
+
+    _clear_post_caches()
 
 def get_post_by_id(post_id: int) -> Optional[dict]:
     """Get a specific post by ID"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    c = conn.cursor()
-    
-    c.execute("SELECT * FROM posts WHERE id = ?", (post_id,))
-    row = c.fetchone()
-    
-    conn.close()
-    
+    cached = _post_cache.get(post_id)
+    if cached is not None:
+        return cached
+
+    with _read_conn() as conn:
+        row = conn.execute("SELECT * FROM posts WHERE id = ?", (post_id,)).fetchone()
+
     if row:
-        columns = ['id', 'content', 'platforms', 'scheduled_time', 'status', 'created_at', 'error_message']
-        return dict(zip(columns, row))
-    
+        # Row carries the column names, so no hand-maintained list to
+        # keep in sync with the schema
+        post = dict(row)
+        _post_cache.set(post_id, post)
+        return post
+
     return None
 
 def save_api_credentials(platform: str, credentials: str):
     """Save API credentials for a platform"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    c = conn.cursor()
-    
-    c.execute('''INSERT OR REPLACE INTO api_credentials (platform, credentials)
-                 VALUES (?, ?)''',
-              (platform, credentials))
-    
-    conn.commit()
-    conn.close()
+    conn = _get_conn()
+    with _write_lock:
+        conn.execute('''INSERT OR REPLACE INTO api_credentials (platform, credentials)
+                        VALUES (?, ?)''',
+                     (platform, credentials))
+        conn.commit()
+
+    _creds_cache.delete(platform)
+    try:
+        get_configured_platforms.clear()
+    except Exception:
+        pass
+
+@st.cache_data(ttl=300, show_spinner=False)
+def get_configured_platforms() -> List[str]:
+    """Platforms that have credentials stored in the database.
+
+    Lets callers skip a per-platform credentials query when nothing was
+    ever saved for that platform.
+    """
+    try:
+        with _read_conn() as conn:
+            rows = conn.execute("SELECT platform FROM api_credentials").fetchall()
+        return [platform for (platform,) in rows]
+    except Exception as e:
+        print(f"Error retrieving configured platforms: {e}")
+        return []
 
 def get_api_credentials(platform: str) -> Optional[str]:
     """Get API credentials for a platform"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    c = conn.cursor()
-    
-    c.execute("SELECT credentials FROM api_credentials WHERE platform = ?", (platform,))
-    row = c.fetchone()
-    
-    conn.close()
-    
-    return row[0] if row else None
+    cached = _creds_cache.get(platform)
+    if cached is not None:
+        return cached
+
+    with _read_conn() as conn:
+        row = conn.execute(
+            "SELECT credentials FROM api_credentials WHERE platform = ?",
+            (platform,)).fetchone()
+
+    if row:
+        _creds_cache.set(platform, row[0])
+        return row[0]
+
+    return None
 
 def add_to_queue(post_id: int, platform: str):
     """Add a post to the platform-specific queue"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    c = conn.cursor()
-    
-    c.execute('''INSERT INTO post_queue (post_id, platform, status)
-                 VALUES (?, ?, 'pending')''',
-              (post_id, platform))
-    
-    conn.commit()
-    conn.close()
+    conn = _get_conn()
+    with _write_lock:
+        conn.execute('''INSERT INTO post_queue (post_id, platform, status)
+                        VALUES (?, ?, 'pending')''',
+                     (post_id, platform))
+        conn.commit()
+
+def add_many_to_queue(post_id: int, platforms: List[str]):
+    """Queue a post for several platforms in one transaction.
+
+    One executemany plus one commit costs a single fsync instead of one
+    per platform.
+    """
+    conn = _get_conn()
+    with _write_lock:
+        conn.executemany('''INSERT INTO post_queue (post_id, platform, status)
+                            VALUES (?, ?, 'pending')''',
+                         [(post_id, p.strip()) for p in platforms])
+        conn.commit()
 
 def get_queue_items(platform: str, limit: int = 10) -> pd.DataFrame:
     """Get pending queue items for a platform"""
     try:
-        conn = sqlite3.connect(DATABASE_PATH)
-        df = pd.read_sql_query(
-            """SELECT pq.*, p.content, p.platforms 
-               FROM post_queue pq
-               JOIN posts p ON pq.post_id = p.id
-               WHERE pq.platform = ? AND pq.status = 'pending'
-               ORDER BY pq.id ASC
-               LIMIT ?""", 
-            conn, params=(platform, limit)
-        )
-        conn.close()
-        return df
+        with _read_conn() as conn:
+            return pd.read_sql_query(
+                """SELECT pq.*, p.content, p.platforms
+                   FROM post_queue pq
+                   JOIN posts p ON pq.post_id = p.id
+                   WHERE pq.platform = ? AND pq.status = 'pending'
+                   AND (pq.next_attempt_at IS NULL OR pq.next_attempt_at <= datetime('now'))
+                   ORDER BY pq.id ASC
+                   LIMIT ?""",
+                conn, params=(platform, limit)
+            )
     except Exception as e:
         print(f"Error retrieving queue items: {e}")
         return pd.DataFrame()
 
+def get_queue_items_rows(platform: str, limit: int = 10) -> List[sqlite3.Row]:
+    """Pending queue items as sqlite3.Row objects for the queue worker.
+
+    The worker only needs keyed access per item, so this skips the
+    DataFrame build (and its type inference) that get_queue_items pays
+    for table rendering in the UI.
+    """
+    try:
+        with _read_conn() as conn:
+            return conn.execute(
+                """SELECT pq.*, p.content, p.platforms
+                   FROM post_queue pq
+                   JOIN posts p ON pq.post_id = p.id
+                   WHERE pq.platform = ? AND pq.status = 'pending'
+                   AND (pq.next_attempt_at IS NULL OR pq.next_attempt_at <= datetime('now'))
+                   ORDER BY pq.id ASC
+                   LIMIT ?""",
+                (platform, limit)).fetchall()
+    except Exception as e:
+        print(f"Error retrieving queue items: {e}")
+        return []
+
 def update_queue_status(queue_id: int, status: str, retry_count: int = None):
     """Update queue item status"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    c = conn.cursor()
-    
-    if retry_count is not None:
-        c.execute('''UPDATE post_queue 
-                     SET status = ?, retry_count = ?, last_attempt = CURRENT_TIMESTAMP 
-                     WHERE id = ?''',
-                  (status, retry_count, queue_id))
-    else:
-        c.execute('''UPDATE post_queue 
-                     SET status = ?, last_attempt = CURRENT_TIMESTAMP 
-                     WHERE id = ?''',
-                  (status, queue_id))
-    
-    conn.commit()
-    conn.close()
+    conn = _get_conn()
+    with _write_lock:
+        if retry_count is not None:
+            conn.execute('''UPDATE post_queue
+                            SET status = ?, retry_count = ?, last_attempt = CURRENT_TIMESTAMP
+                            WHERE id = ?''',
+                         (status, retry_count, queue_id))
+        else:
+            conn.execute('''UPDATE post_queue
+                            SET status = ?, last_attempt = CURRENT_TIMESTAMP
+                            WHERE id = ?''',
+                         (status, queue_id))
+        conn.commit()
+
+def defer_queue_item(queue_id: int, retry_count: int, delay_seconds: int):
+    """Return a failed item to the queue, held back for a backoff delay.
+
+    The item stays 'pending' but is skipped by the queue queries until
+    next_attempt_at passes, so retry pacing is independent of the
+    worker's wakeup interval.
+    """
+    conn = _get_conn()
+    with _write_lock:
+        conn.execute('''UPDATE post_queue
+                        SET status = 'pending', retry_count = ?,
+                            last_attempt = CURRENT_TIMESTAMP,
+                            next_attempt_at = datetime('now', ? || ' seconds')
+                        WHERE id = ?''',
+                     (retry_count, f'+{int(delay_seconds)}', queue_id))
+        conn.commit()
 
 def clean_old_posts(days_old: int = 30):
     """Clean up old completed/failed posts"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    c = conn.cursor()
-    
-    c.execute('''DELETE FROM posts 
-                 WHERE status IN ('posted', 'failed') 
-                 AND datetime(created_at) < datetime('now', '-{} days')'''.format(days_old))
-    
-    conn.commit()
-    conn.close()
\ No newline at end of file
+    conn = _get_conn()
+    with _write_lock:
+        # Bound parameter keeps the SQL text stable (cached plan) and
+        # closes the injection hole the old str.format left open
+        conn.execute('''DELETE FROM posts
+                        WHERE status IN ('posted', 'failed')
+                        AND datetime(created_at) < datetime('now', ?)''',
+                     (f'-{int(days_old)} days',))
+        conn.commit()
@@ -0,0 +1,48 @@
+from typing import Dict
+
+# Single source of truth for the credential fields each platform needs
+# and the environment variable backing each field. Both the Settings
+# page and the API clients read from here, so the two can't drift.
+
+PLATFORM_FIELDS: Dict[str, list] = {
+    "Facebook": ["app_id", "app_secret", "access_token"],
+    "Threads": ["app_id", "app_secret", "access_token"],
+    "X (Twitter)": ["api_key", "api_secret", "access_token", "access_token_secret", "bearer_token"],
+    "LinkedIn": ["client_id", "client_secret", "access_token", "person_urn"],
+    "BlueSky": ["username", "password"],
+    "Mastodon": ["instance_url", "access_token"],
+}
+
+PLATFORM_ENV_MAP: Dict[str, Dict[str, str]] = {
+    "Facebook": {
+        "app_id": "FACEBOOK_APP_ID",
+        "app_secret": "FACEBOOK_APP_SECRET",
+        "access_token": "FACEBOOK_ACCESS_TOKEN",
+    },
+    "Threads": {
+        "app_id": "THREADS_APP_ID",
+        "app_secret": "THREADS_APP_SECRET",
+        "access_token": "THREADS_ACCESS_TOKEN",
+    },
+    "X (Twitter)": {
+        "api_key": "TWITTER_API_KEY",
+        "api_secret": "TWITTER_API_SECRET",
+        "access_token": "TWITTER_ACCESS_TOKEN",
+        "access_token_secret": "TWITTER_ACCESS_TOKEN_SECRET",
+        "bearer_token": "TWITTER_BEARER_TOKEN",
+    },
+    "LinkedIn": {
+        "client_id": "LINKEDIN_CLIENT_ID",
+        "client_secret": "LINKEDIN_CLIENT_SECRET",
+        "access_token": "LINKEDIN_ACCESS_TOKEN",
+        "person_urn": "LINKEDIN_PERSON_URN",
+    },
+    "BlueSky": {
+        "username": "BLUESKY_USERNAME",
+        "password": "BLUESKY_PASSWORD",
+    },
+    "Mastodon": {
+        "instance_url": "MASTODON_INSTANCE_URL",
+        "access_token": "MASTODON_ACCESS_TOKEN",
+    },
+}
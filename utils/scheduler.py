@@ -1,66 +1,92 @@
+import heapq
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from typing import Optional
-import pytz
+from zoneinfo import ZoneInfo
 import os
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.date import DateTrigger
-import streamlit as st
-from utils.database import get_post_by_id, update_post_status, get_scheduled_posts, add_to_queue, get_queue_items, update_queue_status, DATABASE_PATH
+from utils.database import get_post_by_id, update_post_status, iter_scheduled_posts, add_many_to_queue, get_queue_items_rows, update_queue_status, defer_queue_item, _clear_post_caches
 from utils.api_clients import post_to_single_platform, get_rate_limit_delay
 
-# Global scheduler instance
-scheduler = None
-TALLINN_TZ = pytz.timezone(os.getenv('TIMEZONE', 'Europe/Tallinn'))
+TALLINN_TZ = ZoneInfo(os.getenv('TIMEZONE', 'Europe/Tallinn'))
+
+# Platforms the queue worker drains, with their pacing delays resolved
+# once at import instead of per worker cycle
+PLATFORMS = ("Facebook", "Threads", "X (Twitter)", "LinkedIn", "BlueSky", "Mastodon")
+_RATE_LIMITS = {platform: get_rate_limit_delay(platform) for platform in PLATFORMS}
+
+# Base for the exponential retry backoff: 2**retry_count * base seconds
+_RETRY_BASE_DELAY = 15
+
+# Each platform targets its own remote endpoint and has its own rate
+# limit, so the per-platform queues drain in parallel; a slow call to
+# one platform no longer stalls the others. Reads come from the RO
+# connection pool and writes serialize on the shared RW connection.
+_QUEUE_POOL = ThreadPoolExecutor(max_workers=len(PLATFORMS),
+                                 thread_name_prefix="queue")
+
+# Future posts live in a min-heap of (run_at_utc_ts, post_id) drained by
+# the queue worker itself — the posts table is the durable record, so no
+# separate scheduler thread or jobstore is needed. The heap is guarded
+# by _queue_cond's lock; the condition also wakes the worker as soon as
+# new work is enqueued instead of leaving it to wait out a poll interval.
+_sched_heap = []
+_queue_cond = threading.Condition()
+
+_worker_thread: Optional[threading.Thread] = None
+_running = False
+_paused = False
+
+# Makes start_scheduler idempotent under concurrent callers (Streamlit
+# reruns plus add_scheduled_post can race on first use)
+_start_lock = threading.Lock()
+
+def notify_queue_worker():
+    """Wake the queue worker immediately instead of waiting for the next poll"""
+    with _queue_cond:
+        _queue_cond.notify()
 
 def start_scheduler():
-    """Initialize and start the background scheduler"""
-    global scheduler
-    
-    if scheduler is None:
-        scheduler = BackgroundScheduler(timezone=TALLINN_TZ)
-        scheduler.start()
-        
+    """Start the queue/scheduler worker and reload pending schedules.
+
+    Safe to call repeatedly; only the first call spawns the worker.
+    """
+    global _running
+
+    with _start_lock:
+        if _worker_thread is not None:
+            return
+
+        _running = True
+
         # Start the queue processor
         start_queue_processor()
-        
-        # Reschedule any existing scheduled posts
-        reschedule_existing_posts()
+
+    # Reschedule any existing scheduled posts (outside the lock:
+    # add_scheduled_post may call back into start_scheduler)
+    reschedule_existing_posts()
 
 def stop_scheduler():
-    """Stop the scheduler"""
-    global scheduler
-    if scheduler:
-        scheduler.shutdown()
-        scheduler = None
+    """Stop the worker after its current cycle"""
+    global _running, _worker_thread
+    _running = False
+    notify_queue_worker()
+    _worker_thread = None
 
 def add_scheduled_post(post_id: int, scheduled_datetime: datetime):
-    """Add a post to the scheduler"""
-    global scheduler
-    
-    if scheduler is None:
+    """Schedule a post to fire at the given time"""
+    if _worker_thread is None:
         start_scheduler()
-    
-    # Convert to UTC for scheduler
-    utc_datetime = scheduled_datetime.astimezone(timezone.utc)
-    
-    job_id = f"post_{post_id}"
-    
-    # Remove existing job if it exists
-    try:
-        scheduler.remove_job(job_id)
-    except:
-        pass
-    
-    # Add new job
-    scheduler.add_job(
-        func=process_scheduled_post,
-        trigger=DateTrigger(run_date=utc_datetime),
-        args=[post_id],
-        id=job_id,
-        replace_existing=True
-    )
+
+    # The heap orders on UTC timestamps; process_scheduled_post re-checks
+    # the post's status when the entry fires, so a rescheduled or deleted
+    # post just leaves a stale entry that is discarded then
+    utc_ts = scheduled_datetime.astimezone(timezone.utc).timestamp()
+
+    with _queue_cond:
+        heapq.heappush(_sched_heap, (utc_ts, post_id))
+        _queue_cond.notify()
 
 def process_scheduled_post(post_id: int):
     """Process a scheduled post when its time comes"""
@@ -68,198 +94,182 @@ def process_scheduled_post(post_id: int):
         post = get_post_by_id(post_id)
         if not post or post['status'] != 'scheduled':
             return
-        
+
         # Update status to posting
         update_post_status(post_id, 'posting')
-        
-        # Get platforms
-        platforms = post['platforms'].split(',')
-        content = post['content']
-        
-        # Add to queue for each platform
-        for platform in platforms:
-            add_to_queue(post_id, platform.strip())
-        
-        # The queue processor will handle the actual posting
-        
+
+        # Queue all platforms in one transaction (one commit, not one per platform)
+        add_many_to_queue(post_id, post['platforms'].split(','))
+
+        # The queue processor picks the items up on this same cycle
+
     except Exception as e:
         # Mark as failed if something goes wrong
         update_post_status(post_id, 'failed', f"Scheduling error: {str(e)}")
 
+def _pop_due_posts():
+    """Pop and return the IDs of all heap entries that are due now"""
+    due = []
+    now = time.time()
+    with _queue_cond:
+        while _sched_heap and _sched_heap[0][0] <= now:
+            due.append(heapq.heappop(_sched_heap)[1])
+    return due
+
+def _wait_for_work():
+    """Block until notified, the next schedule is due, or 30s passes"""
+    with _queue_cond:
+        timeout = 30.0
+        if _sched_heap:
+            timeout = min(timeout, max(0.0, _sched_heap[0][0] - time.time()))
+        _queue_cond.wait(timeout=timeout)
+
 def start_queue_processor():
     """Start the background queue processor"""
+    global _worker_thread
+
     def queue_worker():
-        """Background worker to process the posting queue"""
-        platforms = ["Facebook", "Threads", "X (Twitter)", "LinkedIn", "BlueSky", "Mastodon"]
-        
-        while True:
+        """Background worker to process schedules and the posting queue"""
+        while _running:
             try:
-                for platform in platforms:
-                    process_platform_queue(platform)
-                
-                # Sleep for 30 seconds between queue checks
-                time.sleep(30)
-                
+                if not _paused:
+                    # Fire any scheduled posts whose time has come
+                    for post_id in _pop_due_posts():
+                        process_scheduled_post(post_id)
+
+                    # Drain all platform queues concurrently; list() waits for
+                    # every platform to finish before the next cycle
+                    list(_QUEUE_POOL.map(process_platform_queue, PLATFORMS))
+
+                _wait_for_work()
+
             except Exception as e:
                 print(f"Queue processor error: {e}")
                 time.sleep(60)  # Longer sleep on error
-    
+
     # Start worker thread
-    worker_thread = threading.Thread(target=queue_worker, daemon=True)
-    worker_thread.start()
+    _worker_thread = threading.Thread(target=queue_worker, daemon=True)
+    _worker_thread.start()
 
 def process_platform_queue(platform: str):
     """Process pending items for a specific platform"""
     try:
-        # Get pending items for this platform
-        queue_items = get_queue_items(platform, limit=5)
-        
-        if queue_items.empty:
+        # Get pending items for this platform as plain rows; the worker
+        # only needs keyed access, not a DataFrame
+        queue_items = get_queue_items_rows(platform, limit=5)
+
+        if not queue_items:
             return
-        
-        rate_limit_delay = get_rate_limit_delay(platform)
-        
-        for idx, item in queue_items.iterrows():
+
+        rate_limit_delay = _RATE_LIMITS.get(platform, 15)
+
+        for idx, item in enumerate(queue_items):
             try:
                 # Get the post content
                 content = item['content']
                 post_id = item['post_id']
                 queue_id = item['id']
-                
+
                 # Update queue status to processing
                 update_queue_status(queue_id, 'processing')
-                
+
                 # Attempt to post
                 success, error_message = post_to_single_platform(content, platform)
-                
+
                 if success:
-                    # Mark queue item as completed
+                    # Mark queue item as completed; the trg_post_completion
+                    # trigger promotes the post's status inside the same
+                    # write transaction once its last platform finishes
                     update_queue_status(queue_id, 'completed')
-                    
-                    # Check if all platforms for this post are done
-                    check_post_completion(post_id)
-                    
+                    _clear_post_caches()
+
                 else:
                     # Handle failure
-                    retry_count = item.get('retry_count', 0) + 1
-                    
+                    retry_count = (item['retry_count'] or 0) + 1
+
                     if retry_count <= 3:  # Max 3 retries
-                        # Mark for retry
-                        update_queue_status(queue_id, 'pending', retry_count)
+                        # Re-queue with exponential backoff so a flaky
+                        # platform doesn't get hammered every cycle
+                        defer_queue_item(queue_id, retry_count,
+                                         (2 ** retry_count) * _RETRY_BASE_DELAY)
                     else:
                         # Max retries reached, mark as failed
                         update_queue_status(queue_id, 'failed', retry_count)
                         update_post_status(post_id, 'failed', f"{platform}: {error_message}")
-                
-                # Rate limiting delay
-                time.sleep(rate_limit_delay)
-                
+
+                # Rate limiting delay between items; nothing follows the
+                # last one, so no need to sleep after it
+                if idx < len(queue_items) - 1:
+                    time.sleep(rate_limit_delay)
+
             except Exception as e:
                 # Mark queue item as failed
                 update_queue_status(item['id'], 'failed')
                 print(f"Error processing queue item {item['id']}: {e}")
-    
-    except Exception as e:
-        print(f"Error processing {platform} queue: {e}")
 
-def check_post_completion(post_id: int):
-    """Check if all platforms for a post have completed and update post status"""
-    try:
-        from utils.database import get_queue_items
-        import sqlite3
-        
-        # Check queue status for all platforms of this post
-        conn = sqlite3.connect(DATABASE_PATH)
-        c = conn.cursor()
-        
-        c.execute("""
-            SELECT COUNT(*) as total, 
-                   SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END) as completed,
-                   SUM(CASE WHEN status = 'failed' THEN 1 ELSE 0 END) as failed
-            FROM post_queue 
-            WHERE post_id = ?
-        """, (post_id,))
-        
-        result = c.fetchone()
-        conn.close()
-        
-        if result:
-            total, completed, failed = result
-            
-            if completed + failed == total:  # All done
-                if completed == total:  # All successful
-                    update_post_status(post_id, 'posted')
-                elif completed > 0:  # Partial success
-                    update_post_status(post_id, 'partial', f"Posted to {completed}/{total} platforms")
-                else:  # All failed
-                    update_post_status(post_id, 'failed', "Failed to post to all platforms")
-    
     except Exception as e:
-        print(f"Error checking post completion: {e}")
+        print(f"Error processing {platform} queue: {e}")
 
 def reschedule_existing_posts():
     """Reschedule any existing scheduled posts after app restart"""
     try:
-        scheduled_posts = get_scheduled_posts()
-        
-        for idx, post in scheduled_posts.iterrows():
+        # Plain rows instead of a DataFrame: this runs on app cold start,
+        # where skipping the DataFrame build keeps startup snappy
+        for post in iter_scheduled_posts():
             if post['scheduled_time']:
                 try:
                     # Parse the scheduled time
                     scheduled_dt = datetime.fromisoformat(post['scheduled_time'])
-                    
-                    # Make sure it's timezone-aware
+
+                    # Make sure it's timezone-aware (zoneinfo attaches
+                    # directly, no pytz localize/normalize detour)
                     if scheduled_dt.tzinfo is None:
-                        scheduled_dt = TALLINN_TZ.localize(scheduled_dt)
-                    
+                        scheduled_dt = scheduled_dt.replace(tzinfo=TALLINN_TZ)
+
                     # Only reschedule future posts
                     if scheduled_dt > datetime.now(TALLINN_TZ):
                         add_scheduled_post(post['id'], scheduled_dt)
                     else:
                         # Past posts should be marked as failed
                         update_post_status(post['id'], 'failed', "Missed scheduled time")
-                
+
                 except Exception as e:
                     print(f"Error rescheduling post {post['id']}: {e}")
                     update_post_status(post['id'], 'failed', f"Rescheduling error: {str(e)}")
-    
+
     except Exception as e:
         print(f"Error during reschedule: {e}")
 
 def remove_scheduled_post(post_id: int):
-    """Remove a post from the scheduler"""
-    global scheduler
-    
-    if scheduler:
-        job_id = f"post_{post_id}"
-        try:
-            scheduler.remove_job(job_id)
-        except:
-            pass  # Job might not exist
+    """Remove a post from the schedule.
+
+    Heap entries are discarded lazily: when one fires,
+    process_scheduled_post sees the post is no longer 'scheduled' (or no
+    longer exists) and skips it, so nothing needs to be dug out here.
+    """
+    pass
 
 def get_scheduler_status():
     """Get current scheduler status for debugging"""
-    global scheduler
-    
-    if scheduler is None:
+    if _worker_thread is None:
         return "Scheduler not started"
-    
-    if scheduler.running:
-        jobs = scheduler.get_jobs()
-        return f"Scheduler running with {len(jobs)} jobs"
+
+    if _worker_thread.is_alive() and _running:
+        with _queue_cond:
+            pending = len(_sched_heap)
+        return f"Scheduler running with {pending} jobs"
     else:
         return "Scheduler stopped"
 
 def pause_scheduler():
     """Pause the scheduler"""
-    global scheduler
-    if scheduler:
-        scheduler.pause()
+    global _paused
+    _paused = True
 
 def resume_scheduler():
     """Resume the scheduler"""
-    global scheduler
-    if scheduler:
-        scheduler.resume()
+    global _paused
+    _paused = False
+    notify_queue_worker()
 
-# Note: Scheduler is started explicitly by the app entrypoint (Home.py)
\ No newline at end of file
+# Note: Scheduler is started explicitly by the app entrypoint (Home.py)